@@ -0,0 +1 @@
+# Keeps the repository root on sys.path so `pytest` can import the tasky package.
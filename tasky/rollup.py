@@ -0,0 +1,175 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Iterator, Union
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+
+from .models import Project, TaskSession
+
+FIELDS = ["project", "day", "duration_seconds", "sessions"]
+
+# (project name, ISO day) -> (total duration in seconds, session count)
+Aggregates = dict[tuple[str, str], tuple[int, int]]
+
+
+def aggregate_database(path: str) -> tuple[Aggregates, float]:
+    """
+    Computes per-project, per-day totals for a single tasky.db file.
+    The database is opened read-only so a file that is in use is never modified.
+    Returns the partial aggregates and the elapsed time in seconds.
+    """
+    started = time.perf_counter()
+    uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+    engine = create_engine("sqlite://", creator=lambda: sqlite3.connect(uri, uri=True))
+    day = func.date(TaskSession.start_time)
+    query = (
+        select(
+            Project.name,
+            day,
+            func.sum(TaskSession.duration_seconds),
+            func.count(TaskSession.id),
+        )
+        .join(Project, TaskSession.project_id == Project.id)
+        .group_by(Project.name, day)
+    )
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(query).all()
+    finally:
+        engine.dispose()
+
+    aggregates = {(name, day): (int(seconds or 0), count) for name, day, seconds, count in rows}
+    return aggregates, time.perf_counter() - started
+
+
+def merge_aggregates(target: Aggregates, partial: Aggregates) -> None:
+    """
+    Merges partial aggregates into target, keyed by project name and day.
+    """
+    for key, (seconds, count) in partial.items():
+        total_seconds, total_count = target.get(key, (0, 0))
+        target[key] = (total_seconds + seconds, total_count + count)
+
+
+def describe_error(error: Exception) -> str:
+    """
+    Returns a one-line description of a database error, without the SQL statement.
+    """
+    if isinstance(error, DBAPIError) and error.orig is not None:
+        error = error.orig
+    lines = str(error).strip().splitlines()
+    return lines[0] if lines else type(error).__name__
+
+
+def rollup(paths: list[str], workers: Union[int, None] = None, log=None) -> tuple[Aggregates, list[str]]:
+    """
+    Aggregates many tasky.db files in a process pool, one file per task.
+    Paths pointing to the same file are only aggregated once.
+    Per-file timings and failures are written to log as each file finishes.
+    Returns the merged totals and the paths that could not be read.
+    """
+    log = log or sys.stderr
+    seen: set[Path] = set()
+    unique_paths: list[str] = []
+    for path in paths:
+        resolved = Path(path).resolve()
+        if resolved not in seen:
+            seen.add(resolved)
+            unique_paths.append(path)
+
+    totals: Aggregates = {}
+    failed: list[str] = []
+    started = time.perf_counter()
+    # Never start more processes than there are files to read.
+    max_workers = max(1, min(workers or os.cpu_count() or 1, len(unique_paths)))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(aggregate_database, path): path for path in unique_paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                partial, elapsed = future.result()
+            except (SQLAlchemyError, sqlite3.Error) as error:
+                failed.append(path)
+                print(f"{path}: failed ({describe_error(error)})", file=log)
+                continue
+            merge_aggregates(totals, partial)
+            print(f"{path}: {len(partial)} rows in {elapsed:.3f}s", file=log)
+    print(f"{len(unique_paths)} files in {time.perf_counter() - started:.3f}s", file=log)
+    return totals, failed
+
+
+def iter_rows(totals: Aggregates) -> Iterator[dict]:
+    """
+    Yields merged aggregates as rows ordered by project name and day.
+    """
+    for (project, day), (seconds, count) in sorted(totals.items()):
+        yield {"project": project, "day": day, "duration_seconds": seconds, "sessions": count}
+
+
+def write_rows(rows: Iterator[dict], output_format: str, out=None) -> None:
+    """
+    Writes rows to out as CSV or as JSON Lines, one object per line.
+    """
+    out = out or sys.stdout
+    if output_format == "csv":
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    else:
+        for row in rows:
+            out.write(json.dumps(row) + "\n")
+
+
+def positive_int(value: str) -> int:
+    """
+    Argparse type for options that must be a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
+
+
+def main(argv: Union[list[str], None] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tasky.rollup",
+        description="Aggregate time per project and day across many tasky.db files.",
+    )
+    parser.add_argument("databases", nargs="+", help="tasky.db files to aggregate")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv", help="output format")
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=None,
+        help=f"number of worker processes, capped at the number of files (default: {os.cpu_count()})",
+    )
+    parser.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="write totals for the readable files even if some fail (still exits non-zero)",
+    )
+    args = parser.parse_args(argv)
+
+    totals, failed = rollup(args.databases, workers=args.workers)
+    if failed:
+        print(f"{len(failed)} file(s) could not be read", file=sys.stderr)
+        if not args.keep_going:
+            return 1
+    write_rows(iter_rows(totals), args.format)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
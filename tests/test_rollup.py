@@ -0,0 +1,144 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from tasky.models import Base, Project, TaskSession
+from tasky.rollup import aggregate_database, main, merge_aggregates, rollup, write_rows
+
+MONDAY = datetime.datetime(2025, 3, 3, 9, 0)
+TUESDAY = datetime.datetime(2025, 3, 4, 9, 0)
+
+
+def make_db(path, sessions):
+    """Creates a tasky.db at path with (project name or None, start_time, duration) sessions."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        projects = {}
+        for name, start_time, duration in sessions:
+            project = None
+            if name is not None:
+                project = projects.setdefault(name, Project(name=name))
+            session.add(
+                TaskSession(
+                    title="task",
+                    start_time=start_time,
+                    duration_seconds=duration,
+                    project=project,
+                )
+            )
+        session.commit()
+    engine.dispose()
+    return str(path)
+
+
+@pytest.fixture
+def databases(tmp_path):
+    alice = make_db(
+        tmp_path / "alice.db",
+        [
+            ("Work", MONDAY, 600),
+            ("Work", MONDAY, 300),
+            ("Work", TUESDAY, 120),
+            (None, MONDAY, 999),
+        ],
+    )
+    bob = make_db(
+        tmp_path / "bob.db",
+        [
+            ("Work", MONDAY, 60),
+            ("Home", TUESDAY, 45),
+        ],
+    )
+    return alice, bob
+
+
+def test_aggregate_database(databases):
+    alice, _ = databases
+    aggregates, elapsed = aggregate_database(alice)
+    assert elapsed >= 0
+    assert aggregates == {
+        ("Work", "2025-03-03"): (900, 2),
+        ("Work", "2025-03-04"): (120, 1),
+    }
+
+
+def test_merge_aggregates():
+    totals = {("Work", "2025-03-03"): (100, 1)}
+    merge_aggregates(totals, {("Work", "2025-03-03"): (50, 2), ("Home", "2025-03-03"): (10, 1)})
+    assert totals == {("Work", "2025-03-03"): (150, 3), ("Home", "2025-03-03"): (10, 1)}
+
+
+def test_rollup_merges_by_project_name(databases):
+    log = io.StringIO()
+    totals, failed = rollup(list(databases), workers=2, log=log)
+    assert failed == []
+    assert totals == {
+        ("Work", "2025-03-03"): (960, 3),
+        ("Work", "2025-03-04"): (120, 1),
+        ("Home", "2025-03-04"): (45, 1),
+    }
+    for path in databases:
+        assert f"{path}: " in log.getvalue()
+
+
+def test_rollup_skips_duplicate_paths(databases, tmp_path, monkeypatch):
+    alice, _ = databases
+    monkeypatch.chdir(tmp_path)
+    totals, failed = rollup([alice, "alice.db", alice], workers=1, log=io.StringIO())
+    assert failed == []
+    assert totals[("Work", "2025-03-03")] == (900, 2)
+
+
+def test_rollup_reports_unreadable_files(databases, tmp_path):
+    alice, _ = databases
+    missing = str(tmp_path / "missing.db")
+    junk = tmp_path / "junk.db"
+    junk.write_text("not a database\n" * 100)
+    log = io.StringIO()
+    totals, failed = rollup([alice, missing, str(junk)], workers=2, log=log)
+    assert sorted(failed) == sorted([missing, str(junk)])
+    assert totals[("Work", "2025-03-03")] == (900, 2)
+    failures = [line for line in log.getvalue().splitlines() if "failed" in line]
+    assert len(failures) == 2
+    assert not any("SELECT" in line for line in failures)
+
+
+def test_write_rows_csv():
+    rows = [{"project": "Work", "day": "2025-03-03", "duration_seconds": 960, "sessions": 3}]
+    out = io.StringIO()
+    write_rows(iter(rows), "csv", out=out)
+    assert list(csv.DictReader(io.StringIO(out.getvalue()))) == [
+        {"project": "Work", "day": "2025-03-03", "duration_seconds": "960", "sessions": "3"}
+    ]
+
+
+def test_write_rows_json_lines():
+    rows = [
+        {"project": "Home", "day": "2025-03-04", "duration_seconds": 45, "sessions": 1},
+        {"project": "Work", "day": "2025-03-03", "duration_seconds": 960, "sessions": 3},
+    ]
+    out = io.StringIO()
+    write_rows(iter(rows), "json", out=out)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == rows
+
+
+def test_main_fails_on_unreadable_file(databases, tmp_path, capsys):
+    alice, _ = databases
+    assert main([alice, str(tmp_path / "missing.db")]) == 1
+    assert capsys.readouterr().out == ""
+
+    assert main([alice, str(tmp_path / "missing.db"), "--keep-going", "--format", "json"]) == 1
+    assert json.loads(capsys.readouterr().out.splitlines()[0])["project"] == "Work"
+
+
+def test_main_rejects_non_positive_workers(databases, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        main([databases[0], "--workers", "0"])
+    assert excinfo.value.code == 2
+    assert "positive integer" in capsys.readouterr().err